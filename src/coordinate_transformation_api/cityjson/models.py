@@ -1209,7 +1209,7 @@ class CityjsonV113(BaseModel):
         callback = get_transform_crs_fun_city_json(source_crs, target_crs, epoch=epoch)
         imp_digits = math.ceil(abs(math.log(self.transform.scale[0], 10)))
         self.decompress()
-        self.vertices = [callback(vertex) for vertex in self.vertices]
+        self.vertices = callback(self.vertices)
         # self.vertices = [
         #     list(vertex) for vertex in self.vertices
         # ]  # convert result to list since, callback function to transform coordinates returns tuples
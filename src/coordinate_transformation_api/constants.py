@@ -8,6 +8,8 @@ DEVIATION_VALID_BBOX = [
     8.0,
     56.0,
 ]  # bbox of RD and NAP GeoTIFF grids in epsg:9067 - area valid for doing density check (based on deviation param)
+DEVIATION_DISTANCE_FACTOR = 24.15 * 10**-9  # relation between max segment deviation and max segment length
 DENSITY_CHECK_RESULT_HEADER = "density-check-result"
 THREE_DIMENSIONAL = 3
 TWO_DIMENSIONAL = 2
+BBOX_3D_DIMENSION = 6
@@ -1,10 +1,12 @@
+import json
 import math
-from collections.abc import Callable, Generator
-from functools import partial, wraps
+from collections.abc import Callable, Iterator, Sequence
+from functools import lru_cache, partial, wraps
 from importlib import resources as impresources
-from itertools import chain
+from itertools import chain, islice
 from typing import Any, cast
 
+import numpy as np
 import yaml
 from geodense.lib import (  # type: ignore
     GeojsonObject,
@@ -12,22 +14,21 @@ from geodense.lib import (  # type: ignore
     transform_geojson_geometries,
 )
 from geodense.types import GeojsonGeomNoGeomCollection
-from geojson_pydantic.geometries import _GeometryBase
+from geojson_pydantic import Feature
+from geojson_pydantic.geometries import GeometryCollection, Point, _GeometryBase
 from geojson_pydantic.types import (
     BBox,
-    MultiLineStringCoords,
-    MultiPointCoords,
-    MultiPolygonCoords,
     Position,
     Position2D,
     Position3D,
 )
 from pyproj import CRS, Transformer, transformer
 from shapely import GeometryCollection as ShpGeometryCollection
-from shapely.geometry import shape
+from shapely import from_geojson
 
 from coordinate_transformation_api import assets
 from coordinate_transformation_api.constants import (
+    BBOX_3D_DIMENSION,
     DEFAULT_DIGITS_FOR_ROUNDING,
     HEIGHT_DIGITS_FOR_ROUNDING,
     THREE_DIMENSIONAL,
@@ -38,10 +39,26 @@ from coordinate_transformation_api.models import (
 )
 from coordinate_transformation_api.types import CoordinatesType, ShapelyGeometry
 
+try:  # use LibYAML based loader when available, it is significantly faster than the pure Python loader
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader  # type: ignore
+
+# nesting depth of the positions in the coordinates member of each geometry type, used to flatten and replace the
+# coordinates with fixed depth loops instead of checking every node for a position
+COORDINATES_DEPTH = {
+    "Point": 0,
+    "MultiPoint": 1,
+    "LineString": 1,
+    "MultiLineString": 2,
+    "Polygon": 2,
+    "MultiPolygon": 3,
+}
+
 assets_resources = impresources.files(assets)
 crs_conf = assets_resources.joinpath("crs-config.yaml")
 with open(str(crs_conf)) as f:
-    CRS_CONFIG = yaml.safe_load(f)
+    CRS_CONFIG = yaml.load(f, YamlSafeLoader)
 
 
 def get_precision(crs: CRS) -> int:
@@ -54,96 +71,178 @@ def get_precision(crs: CRS) -> int:
 def get_shapely_objects(
     body: GeojsonObject,
 ) -> list[ShapelyGeometry]:
-    def _shapely_object(geometry: GeojsonGeomNoGeomCollection) -> ShapelyGeometry:
-        return shape(geometry)  # type: ignore
+    def _geojson_str(geometry: GeojsonGeomNoGeomCollection) -> str:
+        return json.dumps(geometry.__geo_interface__)
+
+    result = transform_geojson_geometries(body, _geojson_str)
+    items = result if isinstance(result, list) else [result]
+
+    # parse all geometries with a single call to shapely (GEOS), instead of creating a shapely object per geometry
+    geojson_strs = list(chain.from_iterable(item if isinstance(item, list) else [item] for item in items))
+    geometries = iter(from_geojson(geojson_strs))
 
-    result = transform_geojson_geometries(body, _shapely_object)
     flat_result: list[ShapelyGeometry] = []
-    # check if result iterable
-    if hasattr(result, "__iter__"):
-        for item in result:
-            if isinstance(item, list):
-                flat_result.append(ShpGeometryCollection(item))
-            else:
-                flat_result.append(item)
-    else:
-        flat_result = [result]
+    for item in items:
+        if isinstance(item, list):
+            flat_result.append(ShpGeometryCollection([next(geometries) for _ in item]))
+        else:
+            flat_result.append(next(geometries))
     return flat_result
 
 
 def mutate_geom_coordinates(
     coordinates_callback: Callable[
-        [Position],
-        Position,
+        [Sequence[Position]],
+        list[Position],
     ],
     geom: GeojsonGeomNoGeomCollection,
 ) -> None:
-    """CRS transform geojson geometry objects
+    """CRS transform geojson geometry objects, all coordinates of the geometry are transformed in a single call. The bbox
+    of the geometry (when set) is updated with the transformed coordinates in the same pass
 
     Arguments:
-        geom -- geojson geometry object, coordinates of geometry are edited in place
+        geom -- geojson geometry object, coordinates and bbox of geometry are edited in place
     """
-    geom.coordinates = traverse_geojson_coordinates(
-        coordinates_callback,
-        geom.coordinates,
-    )
-
-
-def traverse_geojson_coordinates(
-    callback: Callable[
-        [Position],
-        Position,
-    ],
-    geojson_coordinates: (Position | MultiPointCoords | MultiLineStringCoords | MultiPolygonCoords),
-) -> Any:  # noqa: ANN401
-    """traverse GeoJSON coordinates object and apply callback function to coordinates-nodes
-
-    Args:
-        obj: GeoJSON coordinates object
-        callback (): callback function to transform coordinates-nodes
+    depth = COORDINATES_DEPTH[geom.type]
+    positions_t = coordinates_callback(_flatten_coordinates(geom.coordinates, depth))
 
-    Returns:
-        GeoJSON coordinates object
-    """
-    if not (hasattr(geojson_coordinates, "latitude") and hasattr(geojson_coordinates, "longitude")):
-        coords = cast(list[list], geojson_coordinates)
-        _self = partial(traverse_geojson_coordinates, callback)
-        return list(map(_self, coords))
+    if depth == 0:
+        geom.coordinates = positions_t[0]
     else:
-        geojson_coordinates_pos = cast(Position, geojson_coordinates)
-        position = callback(geojson_coordinates_pos)
-        return position
-
-
-def get_coordinate_from_geometry(
-    item: _GeometryBase,
-) -> list:
-    return list(chain(explode(item.coordinates)))
-
-
-def explode(coords: Any) -> Generator[Any, Any, None]:  # noqa: ANN401
-    """Explode a GeoJSON geometry's coordinates object and yield coordinate tuples.
-    As long as the input is conforming, the type of the geometry doesn't matter.
-    Source: https://gis.stackexchange.com/a/90554
-    """
-    for e in coords:
-        if isinstance(e, float | int):
-            yield coords
-            break
-        else:
-            yield from explode(e)
-
-
-def get_bbox_from_coordinates(coordinates: Any) -> BBox:  # noqa: ANN401
-    coordinate_tuples = list(zip(*list(explode(coordinates)), strict=False))
-    if len(coordinate_tuples) == TWO_DIMENSIONAL:
-        x, y = coordinate_tuples
-        return min(x), min(y), max(x), max(y)
-    elif len(coordinate_tuples) == THREE_DIMENSIONAL:
-        x, y, z = coordinate_tuples
-        return min(x), min(y), min(z), max(x), max(y), max(z)
+        # the nested coordinate lists are kept, only the positions in the innermost lists are replaced
+        _replace_positions(geom.coordinates, depth, iter(positions_t))
+    if geom.bbox is not None:
+        # a bbox on a geometry without coordinates can not be transformed, so it is dropped
+        geom.bbox = _get_bbox_from_positions(positions_t) if positions_t else None
+
+
+def _flatten_coordinates(coordinates: Any, depth: int) -> list[Position]:  # noqa: ANN401
+    if depth == 0:
+        return [coordinates]
+    for _ in range(depth - 1):
+        coordinates = [item for items in coordinates for item in items]
+    return list(coordinates)
+
+
+def _replace_positions(coordinates: list, depth: int, positions: Iterator[Position]) -> None:
+    """Replace the positions in coordinates (nested lists of depth >= 1) in place, taking the positions from the
+    positions iterator"""
+    if depth == 1:
+        coordinates[:] = islice(positions, len(coordinates))
+        return
+    for item in coordinates:
+        _replace_positions(item, depth - 1, positions)
+
+
+def _get_bbox_from_positions(positions: list[Any]) -> BBox:
+    dim = min(map(len, positions), default=0)
+    # determine min/max in a single pass over the positions, instead of transposing the coordinates first
+    if dim == TWO_DIMENSIONAL:
+        return _get_bbox_2d(positions)
+    elif dim == THREE_DIMENSIONAL:
+        return _get_bbox_3d(positions)
     else:
-        raise ValueError(f"expected dimension of coordinates is either 2 or 3, got {len(coordinate_tuples)}")
+        raise ValueError(f"expected dimension of coordinates is either 2 or 3, got {dim}")
+
+
+def _get_bbox_2d(positions: list[Any]) -> BBox:
+    min_x = max_x = positions[0][0]
+    min_y = max_y = positions[0][1]
+    for position in positions:
+        x = position[0]
+        y = position[1]
+        if x < min_x:
+            min_x = x
+        elif x > max_x:
+            max_x = x
+        if y < min_y:
+            min_y = y
+        elif y > max_y:
+            max_y = y
+    return min_x, min_y, max_x, max_y
+
+
+def _get_bbox_3d(positions: list[Any]) -> BBox:
+    min_x = max_x = positions[0][0]
+    min_y = max_y = positions[0][1]
+    min_z = max_z = positions[0][2]
+    for x, y, z in positions:
+        if x < min_x:
+            min_x = x
+        elif x > max_x:
+            max_x = x
+        if y < min_y:
+            min_y = y
+        elif y > max_y:
+            max_y = y
+        if z < min_z:
+            min_z = z
+        elif z > max_z:
+            max_z = z
+    return min_x, min_y, min_z, max_x, max_y, max_z
+
+
+def get_bbox(item: GeojsonObject | None, use_child_bbox: bool = True) -> BBox | None:
+    """Get bbox of GeoJSON object. For geometry objects the bbox is computed from the coordinates, for other objects
+    the bboxes of the child objects are merged. With use_child_bbox the bbox of a child object is used when set, so
+    coordinates are not traversed again on every level of the GeoJSON object. Without use_child_bbox the bbox is
+    always computed from the coordinates, for bboxes that can not be trusted (such as those of a request body)."""
+    if item is None:
+        return None
+    if isinstance(item, Point):
+        # bbox of a point is the position itself, (x, y, x, y) or (x, y, z, x, y, z)
+        return cast(BBox, (*item.coordinates, *item.coordinates))
+    if isinstance(item, _GeometryBase):
+        positions = _flatten_coordinates(item.coordinates, COORDINATES_DEPTH[item.type])
+        return _get_bbox_from_positions(positions) if positions else None
+
+    children: list[Any]
+    if isinstance(item, Feature):
+        children = [item.geometry]
+    elif isinstance(item, GeometryCollection):
+        children = item.geometries
+    else:  # FeatureCollection
+        children = item.features
+
+    bboxes: list[BBox] = []
+    for child in children:
+        bbox = (
+            child.bbox
+            if use_child_bbox and child is not None and child.bbox is not None
+            else get_bbox(child, use_child_bbox)
+        )
+        if bbox is not None:
+            bboxes.append(bbox)
+    return merge_bboxes(bboxes)
+
+
+def merge_bboxes(bboxes: list[BBox]) -> BBox | None:
+    if not bboxes:
+        return None
+    if all(len(bbox) == BBOX_3D_DIMENSION for bbox in bboxes):
+        bboxes_3d = cast(list[tuple[float, float, float, float, float, float]], bboxes)
+        return (
+            min(bbox[0] for bbox in bboxes_3d),
+            min(bbox[1] for bbox in bboxes_3d),
+            min(bbox[2] for bbox in bboxes_3d),
+            max(bbox[3] for bbox in bboxes_3d),
+            max(bbox[4] for bbox in bboxes_3d),
+            max(bbox[5] for bbox in bboxes_3d),
+        )
+    # mix of 2D and 3D bboxes, reduce to 2D bbox
+    bboxes_2d: list[tuple[float, float, float, float]] = []
+    for bbox in bboxes:
+        if len(bbox) == BBOX_3D_DIMENSION:
+            bbox_3d = cast(tuple[float, float, float, float, float, float], bbox)
+            bboxes_2d.append((bbox_3d[0], bbox_3d[1], bbox_3d[3], bbox_3d[4]))
+        else:
+            bboxes_2d.append(cast(tuple[float, float, float, float], bbox))
+    return (
+        min(bbox[0] for bbox in bboxes_2d),
+        min(bbox[1] for bbox in bboxes_2d),
+        max(bbox[2] for bbox in bboxes_2d),
+        max(bbox[3] for bbox in bboxes_2d),
+    )
 
 
 def exclude_transformation(source_crs_str: str, target_crs_str: str) -> bool:
@@ -190,7 +289,16 @@ def check_axis(s_crs: CRS, t_crs: CRS) -> None:
         )
 
 
-def get_transformer(source_crs: CRS, target_crs: CRS, epoch: float | None) -> Transformer:  # quit
+def get_transformer(source_crs: CRS, target_crs: CRS, epoch: float | None) -> Transformer:
+    # The selected transformer only depends on whether an epoch is provided, not on its value. So the epoch is reduced to
+    # a boolean before looking up the (cached) transformer, this prevents a cache entry for every requested epoch.
+    return _get_transformer(source_crs, target_crs, epoch is not None)
+
+
+@lru_cache(maxsize=128)
+def _get_transformer(source_crs: CRS, target_crs: CRS, has_epoch: bool) -> Transformer:
+    # Creating transformers is expensive (PROJ database lookups, grid loading). Transformers are cached so they are
+    # reused across geometries and requests, as of pyproj 3.1 Transformer objects are thread-safe.
     # Get available transformer through TransformerGroup
     # TODO check/validate if always_xy=True is correct
     tfg = transformer.TransformerGroup(source_crs, target_crs, allow_ballpark=False, always_xy=True)
@@ -206,7 +314,7 @@ def get_transformer(source_crs: CRS, target_crs: CRS, epoch: float | None) -> Tr
     # When no input epoch is given we need to check that we don't perform an time-dependent transformation. Otherwise
     # the transformation would be done with a default epoch value, which isn't correct. So we need to search for the "best"
     # transformation that doesn't include a time-dependent operation methode.
-    if epoch is None:
+    if not has_epoch:
         for tf in tfg.transformers:
             if needs_epoch(tf) is not True:
                 return tf
@@ -215,7 +323,7 @@ def get_transformer(source_crs: CRS, target_crs: CRS, epoch: float | None) -> Tr
     # we don't want to use the 'default' epoch associated with the transformation. Instead, we won't execute the transformation. Because
     # when the transformation is done with the default epoch (e.g. 2010), but the coords are from 2023 this
     # results in wrong results. We prefer giving an exception, rather than a wrong result.
-    if needs_epoch(tfg.transformers[0]) is True and epoch is None:
+    if needs_epoch(tfg.transformers[0]) is True and not has_epoch:
         raise TransformationNotPossibleError(
             src_crs=str(source_crs),
             target_crs=str(target_crs),
@@ -227,11 +335,14 @@ def get_transformer(source_crs: CRS, target_crs: CRS, epoch: float | None) -> Tr
 
 
 def build_input_coord(coord: CoordinatesType, epoch: float | None) -> CoordinatesType:
+    # Coordinates are passed as a tuple of x, y (and z) values, these are either single values or arrays of values (one
+    # item per position) when transforming multiple positions at once.
+
     # When 2D input is given with an epoch we need to add a height. So pyproj knows to
     # that the epoch is an epoch and not the height, without this intervention the epoch
     # would be place in the firth position of the tuple.
     if len(coord) == TWO_DIMENSIONAL and epoch is not None:
-        return tuple([*coord, 0.0, epoch])
+        return tuple([*coord, _full_like_coord(coord[0], 0.0), _full_like_coord(coord[0], epoch)])
 
     # Default behaviour
     # The input_coord == coord that are given. When an epoch is provided with a 3D coord
@@ -240,30 +351,39 @@ def build_input_coord(coord: CoordinatesType, epoch: float | None) -> Coordinate
     input_coord = tuple(
         [
             *coord,
-            (float(epoch) if len(coord) == THREE_DIMENSIONAL and epoch is not None else None),
+            (_full_like_coord(coord[0], epoch) if len(coord) == THREE_DIMENSIONAL and epoch is not None else None),
         ]
     )
 
     return input_coord
 
 
+def _full_like_coord(coord_value: Any, value: float) -> Any:  # noqa: ANN401
+    """Return value as float for a single coordinate value, or as float64 array with the shape of coord_value for an
+    array of coordinate values. Unlike np.full_like, the dtype is not taken from coord_value (which would truncate a
+    float value to int for int coordinates)"""
+    if np.ndim(coord_value) == 0:
+        return float(value)
+    return np.full(np.shape(coord_value), value, dtype=np.float64)
+
+
 def get_transform_crs_fun_city_json(
     source_crs: CRS,
     target_crs: CRS,
     precision: int | None = None,
     epoch: float | None = None,
 ) -> Callable[
-    [list[float]],
-    list[float],
+    [list[list[float]]],
+    list[list[float]],
 ]:
-    fun = get_transform_crs_fun(source_crs, target_crs, precision, epoch)
+    fun = get_transform_crs_batch_fun(source_crs, target_crs, precision, epoch)
 
     @wraps(fun)
-    def inner(val: list[float]) -> list[float]:
-        """wrapper function for transform_crs function to accept and return tuple[float,float,float] for cityjson to satisfy mypy"""
-        val_pos = Position3D(*val)
-        val_pos_t = fun(val_pos)
-        return list(val_pos_t)
+    def inner(vertices: list[list[float]]) -> list[list[float]]:
+        """wrapper function for transform_crs function to accept and return list of vertices (list[float]) for cityjson to satisfy mypy,
+        all vertices are transformed in a single batch"""
+        vertices_t = fun(cast(list[Position], vertices))
+        return [list(vertex) for vertex in vertices_t]
 
     return inner
 
@@ -278,6 +398,25 @@ def get_transform_crs_fun(
     Position,
 ]:
     """TODO: improve type annotation/handling geojson/cityjson transformation, with the current implementation mypy is not complaining"""
+    fun = get_transform_crs_batch_fun(source_crs, target_crs, precision, epoch)
+
+    def inner(val: Position) -> Position:
+        return fun([val])[0]
+
+    return inner
+
+
+def get_transform_crs_batch_fun(
+    source_crs: CRS,
+    target_crs: CRS,
+    precision: int | None = None,
+    epoch: float | None = None,
+) -> Callable[
+    [Sequence[Position]],
+    list[Position],
+]:
+    """Get function to transform a list of positions, all positions are transformed with a single call to the
+    transformer (per dimension of the positions) instead of a call per position"""
 
     if precision is None:
         precision = get_precision(target_crs)
@@ -293,6 +432,12 @@ def get_transform_crs_fun(
             "Transformation Excluded",
         )
 
+    if source_crs == target_crs and epoch is None and not target_crs.is_compound:
+        # Source and target are the same, the transformation is a no-op. Skip the transformer and only round the
+        # coordinates, as would be done with the transformation result.
+        _round_crs = partial(round_crs, len(target_crs.axis_info), precision)
+        return partial(transform_positions, _round_crs)
+
     # We need to do something special for transformation involving a Compound CRS of 2D coordinates with another height system, like NAP or a LAT height
     # - RD + NAP (EPSG:7415)
     # - ETRS89 + NAP (EPSG:9286)
@@ -307,20 +452,57 @@ def get_transform_crs_fun(
 
         # note transformers are injected in transform_compound_crs so they are instantiated only once
         _transform_compound_crs = partial(transform_compound_crs, h_transformer, v_transformer, precision, epoch)
-        return _transform_compound_crs
+        return partial(transform_positions, _transform_compound_crs)
     else:
         transformer = get_transformer(source_crs, target_crs, epoch)
         # note transformer is injected in transform_crs is instantiated once
         # creating transformers is expensive
-        _transform_crs = partial(transform_crs, transformer, precision, epoch)
-        return _transform_crs
+        # dimension of the target crs is checked once, not on every call of transform_crs
+        dim = get_target_dimension(transformer)
+        _transform_crs = partial(transform_crs, transformer, dim, precision, epoch)
+        return partial(transform_positions, _transform_crs)
+
+
+def transform_positions(
+    transform_fun: Callable[[np.ndarray], list[Position]], positions: Sequence[Position]
+) -> list[Position]:
+    """Transform positions with transform_fun, positions are passed to transform_fun as a single array with a row per
+    position. Positions of different dimensions (2D and 3D) are passed in separate calls."""
+    if not positions:
+        return []
+
+    dims = {len(position) for position in positions}
+    if len(dims) == 1:
+        return transform_fun(np.array(positions, dtype=np.float64, order="F"))
+
+    result: list[Position] = list(positions)
+    for dim in dims:
+        indices = [i for i, position in enumerate(positions) if len(position) == dim]
+        positions_t = transform_fun(np.array([positions[i] for i in indices], dtype=np.float64, order="F"))
+        for i, position_t in zip(indices, positions_t, strict=True):
+            result[i] = position_t
+    return result
+
+
+def _round(precision: int | None, values: np.ndarray | list[float]) -> list[float]:
+    # Python's round is used instead of np.round, np.round scales by a power of ten before rounding and can
+    # differ in the last decimal from the correctly rounded value.
+    values_list: list[float] = values.tolist() if isinstance(values, np.ndarray) else values
+    if precision is None:
+        return values_list
+    return [round(val, precision) for val in values_list]
 
 
-def _round(precision: int | None, val: float) -> float | int:
-    if precision is None:
-        return val
-    else:
-        return round(val, precision)
+def round_crs(
+    dim: int,
+    precision: int | None,
+    coords: np.ndarray,
+) -> list[Position]:
+    """Round coords, array with a row per position, returns list of rounded positions. Used instead of transform_crs
+    when source and target crs are the same"""
+    columns = coords.T[0:dim]
+    heights = _round(precision, columns[2]) if len(columns) >= THREE_DIMENSIONAL else None
+    return _to_positions(precision, columns[0], columns[1], heights)
 
 
 def transform_compound_crs(
@@ -328,75 +510,91 @@ def transform_compound_crs(
     v_transformer: Transformer,
     precision: int | None,
     epoch: float | None,
-    val: Position,
-) -> Position:
-    input = tuple([*val, float(epoch)]) if epoch is not None else tuple([*val])
-
-    _round_h = partial(_round, precision)
-    _round_v = partial(_round, HEIGHT_DIGITS_FOR_ROUNDING)
-
-    h = tuple(map(_round_h, h_transformer.transform(*input)))
-    v = tuple(map(_round_v, v_transformer.transform(*input)))
-
-    output_2d = Position2D(*h[:2])
-    output: Position = output_2d
-    if len(v) >= THREE_DIMENSIONAL and not math.isinf(
-        v[2]
-    ):  # note len(v) can be larger than three when epoch is supplied
-        output = Position3D(*output_2d, v[2])
-    else:
-        # height coordinate dropped, since v[2] not added
-        pass
+    coords: np.ndarray,
+) -> list[Position]:
+    """Transform coords, array with a row per position, returns list of transformed positions"""
+    columns = tuple(coords.T)
+    input = tuple([*columns, _full_like_coord(columns[0], epoch)]) if epoch is not None else columns
 
-    if any(
-        [math.isinf(x) for x in output]
-    ):  # checks only positional coordinates, not height. since check if h isinf is already done, and dropped if isinf
-        raise InfValCoordinateError("Coordinates contain inf val")
-    return output
+    v = v_transformer.transform(*input)
+    # coords is a buffer owned by this call, so the horizontal transformation can write its output in place (after
+    # the vertical transformation has read the input)
+    h = _transform_in_place(h_transformer, input)
 
+    # note len(v) can be larger than three when epoch is supplied
+    heights = v[2] if len(v) >= THREE_DIMENSIONAL else None
+    return _to_positions(precision, h[0], h[1], heights)
 
-def transform_crs(
-    transformer: Transformer,
+
+def _to_positions(
     precision: int | None,
-    epoch: float | None,
-    val: Position,
-) -> Position:
+    xs: np.ndarray,
+    ys: np.ndarray,
+    heights: np.ndarray | list[float] | None,
+) -> list[Position]:
+    """Round the x, y (and height) values of (transformed) positions and return them as list of positions. Raises
+    InfValCoordinateError for inf or nan x/y values and nan heights, a position with an inf height is returned as 2D
+    position (height dropped)"""
+    # checks only positional coordinates, not height. since height is dropped if isinf
+    if not (np.isfinite(xs).all() and np.isfinite(ys).all()):
+        raise InfValCoordinateError("Coordinates contain inf or nan val")
+
+    xs_r = _round(precision, xs)
+    ys_r = _round(precision, ys)
+
+    if heights is None:
+        return [Position2D(x, y) for x, y in zip(xs_r, ys_r, strict=True)]
+
+    hs = _round(HEIGHT_DIGITS_FOR_ROUNDING, heights)
+    # an inf height is dropped from the position, but a nan height can not be represented in the (JSON) output
+    if any(math.isnan(height) for height in hs):
+        raise InfValCoordinateError("Coordinates contain inf or nan val")
+    # height coordinate dropped when isinf
+    return [
+        Position2D(x, y) if math.isinf(height) else Position3D(x, y, height)
+        for x, y, height in zip(xs_r, ys_r, hs, strict=True)
+    ]
+
+
+def _transform_in_place(transformer: Transformer, input: tuple[Any, ...] | list[Any]) -> tuple[Any, ...]:
+    # input holds x, y and optionally z and t arrays, missing trailing values are passed as None which is the same as
+    # leaving them out
+    xx, yy, zz, tt = (*input, None, None)[0:4]
+    return transformer.transform(xx, yy, zz, tt, inplace=True)
+
+
+def get_target_dimension(transformer: Transformer) -> int:
     if transformer.target_crs is None:
         raise ValueError("transformer.target_crs is None")
     dim = len(transformer.target_crs.axis_info)
-    if dim is not None and dim != len(val) and TWO_DIMENSIONAL > dim > THREE_DIMENSIONAL:
+    if dim not in (TWO_DIMENSIONAL, THREE_DIMENSIONAL):
         # check so we can safely cast to tuple[float, float], tuple[float, float, float]
         raise ValueError(f"dimension of target-crs should be 2 or 3, is {dim}")
+    return dim
 
+
+def transform_crs(
+    transformer: Transformer,
+    dim: int,
+    precision: int | None,
+    epoch: float | None,
+    coords: np.ndarray,
+) -> list[Position]:
+    """Transform coords, array with a row per position, returns list of transformed positions. dim is the dimension
+    of the target crs, see get_target_dimension"""
     # TODO: fix epoch handling, should only be added in certain cases
     # when one of the src or tgt crs has a dynamic time component
     # or the transformation used has a datetime component
     # for now simple check on coords length (which is not correct)
-    input = build_input_coord(val, epoch)
+    input = build_input_coord(tuple(coords.T), epoch)
 
     # GeoJSON and CityJSON by definition has coordinates always in lon-lat-height (or x-y-z) order. Transformer has been created with `always_xy=True`,
     # to ensure input and output coordinates are in in lon-lat-height (or x-y-z) order.
     # Regarding the epoch: this is stripped from the result of the transformer. It's used as a input parameter for the transformation but is not
     # 'needed' in the result, because there is no conversion of time, e.i. an epoch value of 2010.0 will stay 2010.0 in the result. Therefor the result
     # of the transformer is 'stripped' with [0:dim]
-    _round_h = partial(_round, precision)
-    _round_v = partial(_round, HEIGHT_DIGITS_FOR_ROUNDING)
-
-    _output = tuple(map(_round_h, transformer.transform(*input)[0:dim]))
-
-    # - 1 van de twee compound
-    # -
-
-    output_2d = Position2D(*_output[:2])
-    output: Position = output_2d
-    if len(_output) >= THREE_DIMENSIONAL:
-        height = _round_v(_output[2])
-        if not math.isinf(height):
-            output = Position3D(*output_2d, height)
-        else:
-            # height coordinate dropped
-            pass
+    # coords is a buffer owned by this call, so the output is written in place instead of allocating new arrays
+    _output = _transform_in_place(transformer, input)[0:dim]
 
-    if any([math.isinf(x) for x in output]):
-        raise InfValCoordinateError("Coordinates contain inf val")
-    return output
+    heights = _round(precision, _output[2]) if len(_output) >= THREE_DIMENSIONAL else None
+    return _to_positions(precision, _output[0], _output[1], heights)
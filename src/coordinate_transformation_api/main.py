@@ -63,6 +63,7 @@ from coordinate_transformation_api.util import (
     get_src_crs_densify,
     get_transform_get_crss,
     init_oas,
+    model_dump_json_finite,
     post_transform_get_crss,
     raise_request_validation_error,
     raise_response_validation_error,
@@ -78,10 +79,12 @@ logging_conf = assets_resources.joinpath("logging.conf")
 OPEN_API_SPEC: dict
 API_VERSION: str
 CRS_LIST: list[Crs]
+CRS_DICT: dict[str, Crs]
 OPEN_API_SPEC, API_TITLE, API_VERSION = init_oas(CRS_CONFIG)
 crs_identifiers: list[str] = OPEN_API_SPEC["components"]["schemas"]["CrsEnum"]["enum"]
 crs_header_identifiers: list[str] = OPEN_API_SPEC["components"]["schemas"]["CrsHeaderEnum"]["enum"]
 CRS_LIST = [Crs.from_crs_str(x) for x in crs_identifiers]
+CRS_DICT = {x.crs_auth_identifier: x for x in CRS_LIST}
 BASE_DIR: str = os.path.dirname(__file__)
 logger: logging.Logger
 
@@ -238,8 +241,7 @@ async def crss() -> list[Crs]:
 
 @app.get("/crss/{crs_id}", response_model=Crs)
 async def crs(crs_id: str) -> Crs | Response:
-    gen = (crs for crs in CRS_LIST if crs.crs_auth_identifier == crs_id)
-    result = next(gen, None)
+    result = CRS_DICT.get(crs_id)
 
     if result is None:
         raise CrsNotFoundError(crs_id)
@@ -277,9 +279,10 @@ async def densify(  # noqa: ANN201
 
     s_crs = get_src_crs_densify(body, source_crs_str, content_crs_str)
     body_d = densify_request_body(body, s_crs, max_segment_deviation, max_segment_length)
-    return JSONResponse(
-        content=body_d.model_dump(exclude_none=True),
+    return Response(
+        content=model_dump_json_finite(body_d),
         headers=set_response_headers(("content-crs", Crs.from_crs_str(s_crs).crs)),
+        media_type="application/json",
     )
 
 
@@ -316,7 +319,7 @@ async def density_check(  # noqa: ANN201
     headers = {}
     if not report.check_result:
         headers = set_response_headers(("content-crs", Crs.from_crs_str(s_crs).crs))
-    return JSONResponse(report.model_dump(exclude_none=True), headers=headers)
+    return Response(model_dump_json_finite(report), headers=headers, media_type="application/json")
 
 
 @app.get("/transform")
@@ -343,7 +346,7 @@ async def transform(  # noqa: PLR0913, ANN201
 
     check_crs_is_known(
         target_crs_str,
-        CRS_LIST,
+        CRS_DICT,
     )
 
     s_crs, t_crs = get_transform_get_crss(source_crs_str, target_crs_str, content_crs_str, accept_crs_str)
@@ -356,7 +359,7 @@ async def transform(  # noqa: PLR0913, ANN201
         position = Position3D(*_coords_list)
 
     # TODO: following only called from GET transform endpoint, why?
-    validate_coords_source_crs(position, s_crs, CRS_LIST)
+    validate_coords_source_crs(position, s_crs, CRS_DICT)
 
     position_t = transform_coordinates(position, s_crs, t_crs, epoch)
 
@@ -419,7 +422,7 @@ async def post_transform(  # noqa: ANN201, PLR0913
             headers=response_headers,
         )
         return Response(
-            content=body.model_dump_json(exclude_none=True),
+            content=model_dump_json_finite(body),
             headers=response_headers,
             media_type="application/city+json",
         )
@@ -471,10 +474,11 @@ async def post_transform(  # noqa: ANN201, PLR0913
         if epoch is not None:
             response_headers = set_response_headers(("epoch", epoch), headers=response_headers)
 
-        response_body = body_t.model_dump(exclude_none=True)
-        return JSONResponse(
-            content=response_body,
+        # serialize with pydantic directly, instead of dumping to python objects first and serializing with json.dumps
+        return Response(
+            content=model_dump_json_finite(body_t),
             headers=response_headers,
+            media_type="application/json",
         )
 
 
@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import lru_cache
 
 from geodense.geojson import CrsFeatureCollection
 from pydantic import BaseModel, Field, computed_field
@@ -156,6 +157,7 @@ class Crs(BaseModel):
     identifier: str
 
     @classmethod
+    @lru_cache(maxsize=64)
     def from_crs_str(cls, crs_str: str) -> "Crs":  # noqa: ANN102
         # Do some math here and later set the values
         auth, identifier = crs_str.split(":")
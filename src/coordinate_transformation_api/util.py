@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import json
 import logging
 import math
 import re
-from functools import partial
+from collections.abc import Sequence
+from functools import lru_cache, partial
 from importlib import resources as impresources
 from importlib.metadata import version
 from typing import Any, cast
@@ -16,31 +18,32 @@ from geodense.lib import (  # type: ignore
     GeojsonObject,
     check_density_geojson_object,
     densify_geojson_object,
-    transform_geojson_geometries,
     traverse_geojson_geometries,
     validate_geom_type,
 )
 from geodense.models import DenseConfig, GeodenseError
 from geojson_pydantic import Feature, GeometryCollection
-from geojson_pydantic.geometries import Geometry
+from geojson_pydantic.geometries import Geometry, _GeometryBase
 from geojson_pydantic.types import Position
-from pydantic import ValidationError
-from pydantic_core import InitErrorDetails, PydanticCustomError
+from pydantic import BaseModel
 from pyproj import CRS
-from shapely import STRtree, box
+from shapely import box, contains, prepare
 
 from coordinate_transformation_api import assets
 from coordinate_transformation_api.cityjson.models import CityjsonV113
 from coordinate_transformation_api.constants import (
+    BBOX_3D_DIMENSION,
     DENSIFY_CRS_2D,
     DENSIFY_CRS_3D,
+    DEVIATION_DISTANCE_FACTOR,
     DEVIATION_VALID_BBOX,
     THREE_DIMENSIONAL,
 )
 from coordinate_transformation_api.crs_transform import (
-    get_bbox_from_coordinates,
-    get_coordinate_from_geometry,
+    YamlSafeLoader,
+    get_bbox,
     get_precision,
+    get_transform_crs_batch_fun,
     get_transform_crs_fun,
     mutate_geom_coordinates,
 )
@@ -53,15 +56,18 @@ from coordinate_transformation_api.models import (
 )
 from coordinate_transformation_api.settings import app_settings
 
-BBOX_3D_DIMENSION = 6
+# valid bbox geometry is constant, create and prepare it once so it can be reused for every request
+DEVIATION_VALID_BOX = box(
+    DEVIATION_VALID_BBOX[0], DEVIATION_VALID_BBOX[1], DEVIATION_VALID_BBOX[2], DEVIATION_VALID_BBOX[3]
+)
+prepare(DEVIATION_VALID_BOX)
+CRS_URI_PATTERN = re.compile(r"^(https?://www\.opengis\.net/def/crs/)?(.[^/|:]*)(/.*/|:)(.*)")
 
 logger = logging.getLogger(__name__)
 
 
-def validate_coords_source_crs(position: Position, source_crs, projections_axis_info: list[AvailableCrs]):
-    source_crs_dims = next(
-        crs.nr_of_dimensions for crs in projections_axis_info if source_crs == crs.crs_auth_identifier
-    )
+def validate_coords_source_crs(position: Position, source_crs: CRS, projections_axis_info: dict[str, AvailableCrs]):
+    source_crs_dims = projections_axis_info[source_crs.srs].nr_of_dimensions
     if source_crs_dims != len(position):
         raise_request_validation_error(
             "number of coordinates must match number of dimensions of source-crs",
@@ -74,8 +80,9 @@ def camel_to_snake(s):
     return "".join(["_" + c.lower() if c.isupper() else c for c in s]).lstrip("_")
 
 
+@lru_cache(maxsize=256)
 def extract_authority_code(crs: str) -> tuple[str, str]:
-    r = re.search(r"^(https?://www\.opengis\.net/def/crs/)?(.[^/|:]*)(/.*/|:)(.*)", crs)
+    r = CRS_URI_PATTERN.match(crs)
     if r is not None:
         auth = r[2]
         code = r[4]
@@ -91,7 +98,8 @@ def extract_authority_code(crs: str) -> tuple[str, str]:
 def format_as_uri(crs: str) -> str:
     # NOTE: the /0/ is a placeholder and should be based on the epsg database version
     #   discuss what convention we want to follow here...
-    return "http://www.opengis.net/def/crs/{}/0/{}".format(*crs.split(":"))
+    auth, _, code = crs.partition(":")
+    return f"http://www.opengis.net/def/crs/{auth}/0/{code}"
 
 
 def get_source_crs_body(
@@ -102,55 +110,44 @@ def get_source_crs_body(
         source_crs = body.get_crs_auth_code()
     elif isinstance(body, CityjsonV113) and body.metadata is not None and body.metadata.referenceSystem is not None:
         ref_system: str = body.metadata.referenceSystem
-        crs_auth = ref_system.split("/")[-3]
-        crs_id = ref_system.split("/")[-1]
+        # e.g. https://www.opengis.net/def/crs/EPSG/0/7415, only the last three parts are needed
+        crs_auth, _, crs_id = ref_system.rsplit("/", 3)[-3:]
         source_crs = f"{crs_auth}:{crs_id}"
     return source_crs
 
 
 def accept_html(request: Request) -> bool:
-    if "accept" in request.headers:
-        accept_header = request.headers["accept"]
-        if "text/html" in accept_header:
-            return True
-    return False
+    return "text/html" in request.headers.get("accept", "")
 
 
 def request_body_within_valid_bbox(body: GeojsonObject, source_crs: str) -> bool:
-    if source_crs not in [DENSIFY_CRS_2D, DENSIFY_CRS_3D]:
-        transform_f = get_transform_crs_fun(str_to_crs(source_crs), str_to_crs(DENSIFY_CRS_2D))
+    # bbox is computed from the coordinates, bboxes in the request body are not used since these can be incorrect.
+    # The bbox is not set on the request body, the body is returned as is when no transformation is done afterwards
+    body_bbox = get_bbox(body, use_child_bbox=False)
+    if body_bbox is None:
+        # body without coordinates, so no coordinates outside the valid bbox
+        return True
 
-        if body.bbox is None:
-            # set bbox to initial value, otherwise wont be updated
-            body.bbox = (0, 0, 0, 0)
-            body_t = traverse_geojson_geometries(body, None, update_bbox)
+    if len(body_bbox) == BBOX_3D_DIMENSION:
+        # reduce bbox to 2D
+        body_bbox = body_bbox[0:2] + body_bbox[3:5]
 
-        body_bbox = body_t.bbox
-
-        if len(body_t.bbox) == BBOX_3D_DIMENSION:
-            # reduce bbox to 2D
-            body_bbox = body_t.bbox[0:2] + body_t.bbox[3:5]
-
-        body_bbox_t = [
-            *transform_f(body_bbox[:2]),
-            *transform_f(body_bbox[2:]),
-        ]
+    if source_crs not in [DENSIFY_CRS_2D, DENSIFY_CRS_3D]:
+        transform_f = get_transform_crs_batch_fun(str_to_crs(source_crs), str_to_crs(DENSIFY_CRS_2D))
+        # transform both corners of the bbox with a single call
+        lower_corner, upper_corner = transform_f([body_bbox[:2], body_bbox[2:]])
+        body_bbox = [*lower_corner, *upper_corner]
 
-    shapely_bbox = [box(*body_bbox_t)]
-    tree = STRtree(shapely_bbox)
-    contains_index = tree.query(box(*DEVIATION_VALID_BBOX), predicate="contains").tolist()  # type: ignore
-    return len(shapely_bbox) == len(contains_index)
+    # single geometry containment check, no need to build a spatial index
+    return bool(contains(DEVIATION_VALID_BOX, box(*body_bbox)))
 
 
-def update_bbox(item: GeojsonObject):
+def update_bbox(item: GeojsonObject, geometry_bbox_set: bool = False):
+    if geometry_bbox_set and isinstance(item, _GeometryBase):
+        # bbox of geometry object already updated by the geometry callback, see mutate_geom_coordinates
+        return
     if item.bbox is not None:  # only update bbox if already set
-        coords = transform_geojson_geometries(item, get_coordinate_from_geometry)
-        bbox = None
-        # TODO: collect bboxes if not geometry object instead of coordinates
-        if coords:
-            coords = list(filter(lambda x: x is not None, coords))
-            bbox = get_bbox_from_coordinates(coords)
-        item.bbox = bbox
+        item.bbox = get_bbox(item)
 
 
 def crs_transform(
@@ -159,9 +156,9 @@ def crs_transform(
     t_crs: CRS,
     epoch: float | None = None,
 ) -> GeojsonObject:
-    t_callback = get_transform_crs_fun(s_crs, t_crs, epoch=epoch)
+    t_callback = get_transform_crs_batch_fun(s_crs, t_crs, epoch=epoch)
     crs_transform_fun = partial(mutate_geom_coordinates, t_callback)
-    body_t = traverse_geojson_geometries(body, crs_transform_fun, update_bbox)
+    body_t = traverse_geojson_geometries(body, crs_transform_fun, partial(update_bbox, geometry_bbox_set=True))
 
     if isinstance(body_t, CrsFeatureCollection):
         body_t.set_crs_auth_code("{}:{}".format(*t_crs.to_authority()))
@@ -177,25 +174,28 @@ def density_check_request_body(
 ) -> CrsFeatureCollection:
     """Run density check with geodense implementation, by running density check in DENSIFY_CRS."""
     validate_geom_type(body)
+    source_crs_str = "{}:{}".format(*source_crs.to_authority())
     if max_segment_deviation is not None:
-        bbox_check_deviation_set(body, source_crs, max_segment_deviation)
+        bbox_check_deviation_set(body, source_crs_str, max_segment_deviation)
         max_segment_length = convert_deviation_to_distance(max_segment_deviation)
 
     transform_crs = (
         str_to_crs(DENSIFY_CRS_3D) if len(source_crs.axis_info) == THREE_DIMENSIONAL else str_to_crs(DENSIFY_CRS_2D)
     )
-    transform = "{}:{}".format(*source_crs.to_authority()) not in [
+    transform = source_crs_str not in [
         DENSIFY_CRS_3D,
         DENSIFY_CRS_2D,
     ]
 
+    body_t = body
     if transform:
         body_t = crs_transform(
             body, source_crs, transform_crs, epoch=epoch
         )  # !NOTE: crs_transform is required for density_check and densify
-    c = DenseConfig(CRS.from_authority(*DENSIFY_CRS_2D.split(":")), max_segment_length)
+    c = DenseConfig(str_to_crs(DENSIFY_CRS_2D), max_segment_length)
     failed_line_segments = check_density_geojson_object(c, body_t)
 
+    failed_line_segments_t = failed_line_segments
     if transform:
         failed_line_segments_t = crs_transform(failed_line_segments, transform_crs, source_crs, epoch=epoch)
     return failed_line_segments_t
@@ -225,17 +225,16 @@ def densify_request_body(
         bbox_check_deviation_set(body, source_crs, max_segment_deviation)
         max_segment_length = convert_deviation_to_distance(max_segment_deviation)
 
-    source_crs_crs = CRS.from_authority(*source_crs.split(":"))
-    transform_crs = DENSIFY_CRS_3D if len(source_crs_crs.axis_info) == THREE_DIMENSIONAL else DENSIFY_CRS_2D
+    s_crs = str_to_crs(source_crs)
+    transform_crs = DENSIFY_CRS_3D if len(s_crs.axis_info) == THREE_DIMENSIONAL else DENSIFY_CRS_2D
     transform = source_crs not in [DENSIFY_CRS_3D, DENSIFY_CRS_2D]
 
-    s_crs = str_to_crs(source_crs)
     t_crs = str_to_crs(transform_crs)
 
     body_t = body
     if transform:
         body_t = crs_transform(body, s_crs, t_crs)
-    c = DenseConfig(CRS.from_authority(*transform_crs.split(":")), max_segment_length)
+    c = DenseConfig(str_to_crs(transform_crs), max_segment_length)
     try:
         body_t_d = densify_geojson_object(c, body_t)
     except GeodenseError as e:
@@ -263,7 +262,7 @@ def init_oas(crs_config) -> tuple[dict, str, str]:
     available_crss_uri = list(map(lambda x: x["uri"], list(crs_config.values())))
 
     with oas_filepath.open("rb") as oas_file:
-        oas = yaml.load(oas_file, yaml.SafeLoader)
+        oas = yaml.load(oas_file, YamlSafeLoader)  # noqa: S506 (YamlSafeLoader is a safe loader)
         servers = [{"url": app_settings.base_url.strip("/")}]
         oas["servers"] = servers
         oas["info"]["version"] = version("coordinate_transformation_api")
@@ -295,28 +294,33 @@ def init_oas(crs_config) -> tuple[dict, str, str]:
 
 
 def convert_deviation_to_distance(a):
-    d = math.sqrt(a / (24.15 * 10**-9))
+    d = math.sqrt(a / DEVIATION_DISTANCE_FACTOR)
     return d
 
 
+def build_validation_error(
+    error_type: str,
+    message: str,
+    input: Any | None = None,
+    loc: Sequence[int | str | tuple[int | str, ...]] | None = None,
+    ctx: Any | None = None,
+) -> dict[str, Any]:
+    # error in the format of pydantic's ValidationError.errors(), built directly instead of constructing a
+    # ValidationError only to convert it back to a list of error dicts. As in pydantic, loc items other than str or int
+    # are converted to str.
+    error: dict[str, Any] = {
+        "type": error_type,
+        "loc": tuple(x if isinstance(x, str | int) else str(x) for x in loc) if loc is not None else (),
+        "msg": message,
+        "input": input,
+    }
+    if ctx is not None:
+        error["ctx"] = ctx
+    return error
+
+
 def raise_response_validation_error(message: str, location):
-    raise ResponseValidationError(
-        errors=(
-            ValidationError.from_exception_data(
-                "ValueError",
-                [
-                    InitErrorDetails(
-                        type=PydanticCustomError(
-                            "value-error",
-                            message,
-                        ),
-                        loc=location,
-                        input="",
-                    ),
-                ],
-            )
-        ).errors()
-    )
+    raise ResponseValidationError(errors=[build_validation_error("value-error", message, "", location)])
 
 
 def raise_request_validation_error(
@@ -325,24 +329,45 @@ def raise_request_validation_error(
     loc: tuple[int | str, ...] | None = None,
     ctx: Any | None = None,
 ):
-    raise RequestValidationError(
-        errors=(
-            ValidationError.from_exception_data(
-                "ValueError",
-                [
-                    InitErrorDetails(
-                        type=PydanticCustomError(
-                            "missing",
-                            message,
-                        ),
-                        input=input,
-                        **({"ctx": ctx} if ctx is not None else {}),  # type: ignore
-                        **({"loc": loc} if loc is not None else {}),  # type: ignore
-                    ),
-                ],
-            )
-        ).errors(include_context=True)
-    )
+    raise RequestValidationError(errors=[build_validation_error("missing", message, input, loc, ctx)])
+
+
+# the errors for a missing source or target crs are constant, so they are built once
+SOURCE_CRS_MISSING_ERROR = build_validation_error(
+    "missing",
+    "No source CRS found in request. Defining a source CRS is required through the query parameter source-crs or header content-crs",
+    loc=("query", "source-crs", "header", "content-crs"),
+)
+SOURCE_CRS_MISSING_FEATURE_COLLECTION_ERROR = build_validation_error(
+    "missing",
+    "No source CRS found in request. Defining a source CRS is required in the FeatureCollection request body, the source-crs query parameter or the content-crs header",
+    loc=("body", "crs", "query", "source-crs", "header", "content-crs"),
+)
+SOURCE_CRS_MISSING_CRS_FEATURE_COLLECTION_ERROR = build_validation_error(
+    "missing",
+    "No source CRS found in request. Defining a source CRS is required through the provided object a query parameter source-crs or header content-crs",
+    loc=[("body", "crs"), ("query", "source-crs"), ("header", "content-crs")],
+)
+SOURCE_CRS_MISSING_CITYJSON_ERROR = build_validation_error(
+    "missing",
+    "metadata.referenceSystem field missing in CityJSON request body",
+    loc=[
+        (
+            "body",
+            "metadata.referenceSystem",
+        ),
+        ("query", "source-crs"),
+        (
+            "header",
+            "content-crs",
+        ),
+    ],
+)
+TARGET_CRS_MISSING_ERROR = build_validation_error(
+    "missing",
+    "No target CRS found in request. Defining a target CRS is required through the query parameter target-crs or header accept-crs",
+    loc=("query", "target-crs", "header", "accept-crs"),
+)
 
 
 def convert_point_coords_to_wkt(coords):
@@ -352,9 +377,8 @@ def convert_point_coords_to_wkt(coords):
     return f"{geom_type}({' '.join([str(x) for x in coords])})"
 
 
-def check_crs_is_known(crs_str: str, crs_list: list[AvailableCrs]) -> None:
-    crs = next((x for x in crs_list if x.crs_auth_identifier == crs_str), None)
-    if crs is None:
+def check_crs_is_known(crs_str: str, crs_dict: dict[str, AvailableCrs]) -> None:
+    if crs_str not in crs_dict:
         raise ValueError(f"could not instantiate CRS object for CRS with id {crs_str}")
 
 
@@ -393,46 +417,24 @@ def post_transform_get_crss(
     s_crs = get_source_crs(body, source_crs, content_crs)
 
     if s_crs is None and isinstance(body, CrsFeatureCollection):
-        raise_request_validation_error(
-            "No source CRS found in request. Defining a source CRS is required through the provided object a query parameter source-crs or header content-crs",
-            loc=[("body", "crs"), ("query", "source-crs"), ("header", "content-crs")],  # type: ignore
-        )
+        raise RequestValidationError(errors=[SOURCE_CRS_MISSING_CRS_FEATURE_COLLECTION_ERROR])
     elif s_crs is None and isinstance(body, CityjsonV113):
-        raise_request_validation_error(
-            "metadata.referenceSystem field missing in CityJSON request body",
-            loc=[
-                (
-                    "body",
-                    "metadata.referenceSystem",
-                ),
-                ("query", "source-crs"),
-                (
-                    "header",
-                    "content-crs",
-                ),
-            ],  # type: ignore
-        )
+        raise RequestValidationError(errors=[SOURCE_CRS_MISSING_CITYJSON_ERROR])
     elif s_crs is None:
-        raise_request_validation_error(
-            "No source CRS found in request. Defining a source CRS is required through the query parameter source-crs or header content-crs",
-            loc=("query", "source-crs", "header", "content-crs"),
-        )
+        raise RequestValidationError(errors=[SOURCE_CRS_MISSING_ERROR])
 
     if target_crs is not None:
         t_crs = target_crs
     elif target_crs is None and accept_crs is not None:
         t_crs = accept_crs
     else:
-        raise_request_validation_error(
-            "No target CRS found in request. Defining a target CRS is required through the query parameter target-crs or header accept-crs",
-            loc=("query", "target-crs", "header", "accept-crs"),
-        )
+        raise RequestValidationError(errors=[TARGET_CRS_MISSING_ERROR])
 
     s_crs_str = cast(str, s_crs)
     s_authority_code = extract_authority_code(s_crs_str)
     t_authority_code = extract_authority_code(t_crs)
 
-    return CRS.from_authority(*s_authority_code), CRS.from_authority(*t_authority_code)
+    return crs_from_authority(*s_authority_code), crs_from_authority(*t_authority_code)
 
 
 def get_transform_get_crss(
@@ -446,25 +448,19 @@ def get_transform_get_crss(
     elif source_crs is None and content_crs is not None:
         s_crs = content_crs
     else:
-        raise_request_validation_error(
-            "No source CRS found in request. Defining a source CRS is required through the query parameter source-crs or header content-crs",
-            loc=("query", "source-crs", "header", "content-crs"),
-        )
+        raise RequestValidationError(errors=[SOURCE_CRS_MISSING_ERROR])
 
     if target_crs is not None:
         t_crs = target_crs
     elif target_crs is None and accept_crs is not None:
         t_crs = accept_crs
     else:
-        raise_request_validation_error(
-            "No target CRS found in request. Defining a target CRS is required through the query parameter target-crs or header accept-crs",
-            loc=("query", "target-crs", "header", "accept-crs"),
-        )
+        raise RequestValidationError(errors=[TARGET_CRS_MISSING_ERROR])
 
     s_authority_code = extract_authority_code(s_crs)
     t_authority_code = extract_authority_code(t_crs)
 
-    return CRS.from_authority(*s_authority_code), CRS.from_authority(*t_authority_code)
+    return crs_from_authority(*s_authority_code), crs_from_authority(*t_authority_code)
 
 
 def get_src_crs_densify(
@@ -474,15 +470,9 @@ def get_src_crs_densify(
 ) -> str:
     s_crs = get_source_crs(body, source_crs, content_crs)
     if s_crs is None and isinstance(body, CrsFeatureCollection):
-        raise_request_validation_error(
-            "No source CRS found in request. Defining a source CRS is required in the FeatureCollection request body, the source-crs query parameter or the content-crs header",
-            loc=("body", "crs", "query", "source-crs", "header", "content-crs"),
-        )
+        raise RequestValidationError(errors=[SOURCE_CRS_MISSING_FEATURE_COLLECTION_ERROR])
     elif s_crs is None:
-        raise_request_validation_error(
-            "No source CRS found in request. Defining a source CRS is required through the query parameter source-crs or header content-crs",
-            loc=("query", "source-crs", "header", "content-crs"),
-        )
+        raise RequestValidationError(errors=[SOURCE_CRS_MISSING_ERROR])
     return cast(str, s_crs)
 
 
@@ -494,5 +484,23 @@ def set_response_headers(*args, headers: dict[str, str] | None = None) -> dict[s
     return headers
 
 
+def model_dump_json_finite(model: BaseModel) -> str:
+    """Serialize model to JSON (None values excluded), raises ValueError when the model contains inf or nan values.
+    pydantic serializes these as null, where JSONResponse refused to serialize non-finite values"""
+    content = model.model_dump_json(exclude_none=True)
+    # a non-finite value results in null in the serialized output, so only then the (slower) check on the python
+    # objects is needed
+    if "null" in content:
+        json.dumps(model.model_dump(exclude_none=True), allow_nan=False, default=str)
+    return content
+
+
 def str_to_crs(crs_str: str) -> CRS:
-    return CRS.from_authority(*crs_str.split(":"))
+    return crs_from_authority(*crs_str.split(":"))
+
+
+@lru_cache(maxsize=64)
+def crs_from_authority(auth_name: str, code: str) -> CRS:
+    # creating CRS objects requires a PROJ database lookup, the (thread-safe) CRS objects are cached and shared between
+    # requests
+    return CRS.from_authority(auth_name, code)
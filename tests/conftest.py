@@ -1,4 +1,6 @@
+import json
 import os
+from functools import lru_cache
 
 import pytest
 from geodense.lib import textio_to_geojson
@@ -9,6 +11,19 @@ def test_dir():
     return os.path.dirname(os.path.abspath(__file__))
 
 
+@pytest.fixture(scope="session")
+def load_json_data():
+    """Load JSON test data by filename, each file is read and parsed once per test session. The data is shared between
+    tests, so it should not be mutated."""
+
+    @lru_cache
+    def _load_json_data(filename: str):
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", filename)) as f:
+            return json.load(f)
+
+    return _load_json_data
+
+
 @pytest.fixture
 def geometry_collection_bbox(test_dir):
     with open(os.path.join(test_dir, "data", "geometry-collection-bbox.json")) as f:
@@ -8,7 +8,7 @@ def test_cityjson_transformed():
     with open("tests/data/house_1.city.json") as f:
         data = json.load(f)
         cj = CityjsonV113.model_validate(data)
-        cj_original = CityjsonV113.model_validate(data)
+        cj_original = cj.model_copy(deep=True)
 
         cj.crs_transform(str_to_crs("EPSG:7415"), str_to_crs("EPSG:7931"), 2010.0)
         assert cj.metadata.geographicalExtent != cj_original.metadata.geographicalExtent
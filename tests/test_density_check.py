@@ -0,0 +1,61 @@
+import pytest
+from geodense.geojson import CrsFeatureCollection
+from geojson_pydantic import Feature
+
+from coordinate_transformation_api.models import DeviationOutOfBboxError
+from coordinate_transformation_api.util import density_check_request_body, str_to_crs
+
+
+def _line_feature(coordinates):
+    return Feature(
+        type="Feature",
+        properties={},
+        geometry={"type": "LineString", "coordinates": coordinates},
+    )
+
+
+@pytest.mark.parametrize(
+    ("max_segment_deviation", "expectation"),
+    [
+        (0.01, 1),
+        (1000.0, 0),
+    ],
+)
+def test_density_check_max_segment_deviation_densify_crs(max_segment_deviation, expectation):
+    # source crs is the densify crs, so no transformation is done before and after the density check
+    feature = _line_feature([[5.0, 52.0], [5.5, 52.5]])
+
+    result = density_check_request_body(feature, str_to_crs("OGC:CRS84"), max_segment_deviation, None, None)
+
+    assert isinstance(result, CrsFeatureCollection)
+    assert len(result.features) == expectation
+    if expectation:
+        assert [tuple(position) for position in result.features[0].geometry.coordinates] == [(5.0, 52.0), (5.5, 52.5)]
+
+
+@pytest.mark.parametrize(
+    ("max_segment_deviation", "expectation"),
+    [
+        (0.01, 19),
+        (1000.0, 0),
+    ],
+)
+def test_density_check_max_segment_deviation(load_json_data, max_segment_deviation, expectation):
+    body = CrsFeatureCollection(**load_json_data("linestrings-within-bbox.json"))
+
+    result = density_check_request_body(body, str_to_crs("EPSG:28992"), max_segment_deviation, None, None)
+
+    assert isinstance(result, CrsFeatureCollection)
+    assert len(result.features) == expectation
+    if expectation:
+        # failed line segments are returned in the source crs
+        first_segment = result.features[0].geometry.coordinates
+        assert first_segment[0] == pytest.approx((156264.906359842570964, 601302.588919493253343), abs=0.001)
+        assert first_segment[1] == pytest.approx((165681.964475793502061, 605544.313164469087496), abs=0.001)
+
+
+def test_density_check_max_segment_deviation_out_of_bbox_raises():
+    feature = _line_feature([[10.0, 52.0], [10.5, 52.5]])
+
+    with pytest.raises(DeviationOutOfBboxError):
+        density_check_request_body(feature, str_to_crs("OGC:CRS84"), 0.01, None, None)
@@ -1,15 +1,16 @@
 import json
 
 from geodense.lib import traverse_geojson_geometries
-from geojson_pydantic import Feature
+from geojson_pydantic import Feature, MultiPoint
 from pydantic import ValidationError
 from pyproj import CRS
 
+from coordinate_transformation_api.crs_transform import merge_bboxes
 from coordinate_transformation_api.util import (
     crs_transform,
     update_bbox,
 )
-from tests.util import not_raises
+from tests.util import explode, not_raises
 
 
 def test_feature_bbox():
@@ -23,7 +24,7 @@ def test_feature_bbox():
             CRS.from_authority(*"EPSG:4326".split(":")),
         )
 
-        feature_dict = json.loads(feature.model_dump_json())
+        feature_dict = feature.model_dump(mode="json")
         # check if input is actually transformed
         assert feature_t != feature
         with not_raises(
@@ -70,3 +71,45 @@ def test_update_bbox(geometry_collection_bbox):
 
     bbox_fc_ft1_geom = tuple(round(x, 6) for x in geometry_collection_bbox_t.features[1].geometry.bbox)
     assert bbox_fc_ft1_geom == test_bbox_fc_ft1_geom
+
+
+def _bbox_from_coordinates(coordinates):
+    xs, ys = zip(*[position[0:2] for position in explode(coordinates)], strict=True)
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def test_crs_transform_updates_geometry_bbox(geometry_collection_bbox):
+    geometry_collection_bbox_t = crs_transform(
+        geometry_collection_bbox,
+        CRS.from_authority("EPSG", "28992"),
+        CRS.from_authority("EPSG", "4326"),
+    )
+
+    for geom in geometry_collection_bbox_t.features[0].geometry.geometries:
+        assert geom.bbox == _bbox_from_coordinates(geom.coordinates)
+
+    geom = geometry_collection_bbox_t.features[1].geometry
+    assert geom.bbox == _bbox_from_coordinates(geom.coordinates)
+
+
+def test_crs_transform_drops_bbox_of_empty_geometry():
+    geom = MultiPoint(
+        type="MultiPoint", coordinates=[], bbox=(138871.518882, 592678.040025, 165681.964476, 605544.313164)
+    )
+
+    geom_t = crs_transform(
+        geom,
+        CRS.from_authority("EPSG", "28992"),
+        CRS.from_authority("EPSG", "4326"),
+    )
+
+    assert geom_t.coordinates == []
+    assert geom_t.bbox is None
+
+
+def test_merge_bboxes():
+    assert merge_bboxes([(0, 0, 1, 1), (-1, 0.5, 0.5, 2)]) == (-1, 0, 1, 2)
+    assert merge_bboxes([(0, 0, 0, 1, 1, 1), (-1, 0.5, -2, 0.5, 2, 0)]) == (-1, 0, -2, 1, 2, 1)
+    # mix of 2D and 3D bboxes results in 2D bbox
+    assert merge_bboxes([(0, 0, 1, 1), (-1, 0.5, -2, 0.5, 2, 0)]) == (-1, 0, 1, 2)
+    assert merge_bboxes([]) is None
@@ -1,4 +1,3 @@
-import json
 import math
 from unittest.mock import patch
 
@@ -10,193 +9,291 @@ from geojson_pydantic.geometries import (
     _GeometryBase,
     parse_geometry_obj,
 )
+from geojson_pydantic.types import Position2D, Position3D
 from pydantic import ValidationError
-
-from coordinate_transformation_api.crs_transform import get_transformer
+from pyproj import Transformer
+
+from coordinate_transformation_api.crs_transform import (
+    InfValCoordinateError,
+    get_precision,
+    get_target_dimension,
+    get_transform_crs_batch_fun,
+    get_transform_crs_fun,
+    get_transformer,
+)
 from coordinate_transformation_api.util import (
     crs_transform,
     str_to_crs,
 )
-from tests.util import not_raises
+from tests.util import explode, not_raises
 
 # TODO: add test to signal user geometries or height have been omitted in case transformation not possible
 
 
-def test_transformer_object_created_once_while_transforming():
-    with open("tests/data/polygons.json") as f:
-        data = json.load(f)
-        geojson_obj = CrsFeatureCollection(**data)
+def test_transformer_object_created_once_while_transforming(load_json_data):
+    data = load_json_data("polygons.json")
+    geojson_obj = CrsFeatureCollection(**data)
 
-        with patch(
-            "coordinate_transformation_api.crs_transform.get_transformer",
-            side_effect=get_transformer,
-        ) as get_transformer_call:
-            _ = crs_transform(geojson_obj, str_to_crs("EPSG:28992"), str_to_crs("EPSG:4326"))
-            get_transformer_call.assert_called_once()
+    with patch(
+        "coordinate_transformation_api.crs_transform.get_transformer",
+        side_effect=get_transformer,
+    ) as get_transformer_call:
+        _ = crs_transform(geojson_obj, str_to_crs("EPSG:28992"), str_to_crs("EPSG:4326"))
+        get_transformer_call.assert_called_once()
 
 
-def test_transformer_object_created_thrice_while_transforming_7930_7415():
-    with open("tests/data/feature-collection-7930.json") as f:
-        data = json.load(f)
-        geojson_obj = CrsFeatureCollection(**data)
+def test_transformer_object_created_thrice_while_transforming_7930_7415(load_json_data):
+    data = load_json_data("feature-collection-7930.json")
+    geojson_obj = CrsFeatureCollection(**data)
 
-        with patch(
-            "coordinate_transformation_api.crs_transform.get_transformer",
-            side_effect=get_transformer,
-        ) as get_transformer_call:
-            _ = crs_transform(geojson_obj, str_to_crs("EPSG:7930"), str_to_crs("EPSG:7415"))
-            # get_transformer is called 3 times, once for horizontal, once for vertical causes exc, exc caught -> one more call to get_tranformer
-            expected_call_count = 2
-            assert get_transformer_call.call_count == expected_call_count
+    with patch(
+        "coordinate_transformation_api.crs_transform.get_transformer",
+        side_effect=get_transformer,
+    ) as get_transformer_call:
+        _ = crs_transform(geojson_obj, str_to_crs("EPSG:7930"), str_to_crs("EPSG:7415"))
+        # get_transformer is called 3 times, once for horizontal, once for vertical causes exc, exc caught -> one more call to get_tranformer
+        expected_call_count = 2
+        assert get_transformer_call.call_count == expected_call_count
 
 
-def test_bbox_transformed():
-    with open("tests/data/geometry.json") as f:
-        data = json.load(f)
-        geometry = parse_geometry_obj(data)
-        geometry_t = crs_transform(geometry, str_to_crs("EPSG:28992"), str_to_crs("EPSG:4326"))
-        assert geometry.bbox is not None
-        assert geometry_t.bbox is not None
-        assert len(geometry.bbox) == len(geometry_t.bbox)
-        assert geometry.bbox != geometry_t.bbox
+def test_bbox_transformed(load_json_data):
+    data = load_json_data("geometry.json")
+    geometry = parse_geometry_obj(data)
+    geometry_t = crs_transform(geometry, str_to_crs("EPSG:28992"), str_to_crs("EPSG:4326"))
+    assert geometry.bbox is not None
+    assert geometry_t.bbox is not None
+    assert len(geometry.bbox) == len(geometry_t.bbox)
+    assert geometry.bbox != geometry_t.bbox
 
 
 # cs2cs -f %.4f EPSG:28992 EPSG:4326 <<<"138871.518881731899455 597389.993749326560646"
 # cs2cs -f %.4f EPSG:28992 OGC:CRS84 <<<"138871.518881731899455 597389.993749326560646"
 # TODO: test set EPSG:4326 == OGC:CRS84, but with the 'modified' proj.db this isn't the same.
-def test_transform_geometry_crs84_is_epsg4326():
-    with open("tests/data/geometry.json") as f:
-        data = json.load(f)
-        geometry = parse_geometry_obj(data)
+def test_transform_geometry_crs84_is_epsg4326(load_json_data):
+    data = load_json_data("geometry.json")
+    geometry = parse_geometry_obj(data)
 
-        geometry_t_4326 = crs_transform(geometry, str_to_crs("EPSG:28992"), str_to_crs("EPSG:4326"))
-        geometry_t_crs84 = crs_transform(geometry, str_to_crs("EPSG:28992"), str_to_crs("OGC:CRS84"))
+    geometry_t_4326 = crs_transform(geometry, str_to_crs("EPSG:28992"), str_to_crs("EPSG:4326"))
+    geometry_t_crs84 = crs_transform(geometry, str_to_crs("EPSG:28992"), str_to_crs("OGC:CRS84"))
 
-        # check if input is actually transformed
-        assert geometry_t_4326.model_dump_json() != geometry.model_dump_json()
-        assert geometry_t_crs84.model_dump_json() != geometry.model_dump_json()
-        # since axis order is always x,y OGC:CRS84==EPSG:4326 in GeoJSON
-        assert geometry_t_4326.model_dump_json() == geometry_t_crs84.model_dump_json()
+    # check if input is actually transformed
+    assert geometry_t_4326.model_dump_json() != geometry.model_dump_json()
+    assert geometry_t_crs84.model_dump_json() != geometry.model_dump_json()
+    # since axis order is always x,y OGC:CRS84==EPSG:4326 in GeoJSON
+    assert geometry_t_4326.model_dump_json() == geometry_t_crs84.model_dump_json()
 
 
 @pytest.mark.parametrize(
-    ("geojson_path", "object_type"),
+    ("geojson_file", "object_type"),
     [
-        ("tests/data/geometry.json", _GeometryBase),
-        ("tests/data/feature-geometry-collection.json", Feature),
-        ("tests/data/feature.json", Feature),
-        ("tests/data/polygons.json", CrsFeatureCollection),
+        ("geometry.json", _GeometryBase),
+        ("feature-geometry-collection.json", Feature),
+        ("feature.json", Feature),
+        ("polygons.json", CrsFeatureCollection),
         (
-            "tests/data/feature-collection-geometry-collection.json",
+            "feature-collection-geometry-collection.json",
             CrsFeatureCollection,
         ),
-        ("tests/data/geometry-collection.json", GeometryCollection),
+        ("geometry-collection.json", GeometryCollection),
     ],
 )
-def test_transform_geojson_objects(geojson_path, object_type):
-    with open(geojson_path) as f:
-        data = json.load(f)
-
-        geojson_obj = parse_geometry_obj(data) if object_type is _GeometryBase else object_type(**data)
-
-        geojson_obj_t = crs_transform(geojson_obj, str_to_crs("EPSG:28992"), str_to_crs("EPSG:4326"))
-        geojson_obj_t_dict = json.loads(geojson_obj_t.model_dump_json())
-
-        if object_type is CrsFeatureCollection:
-            assert geojson_obj_t.crs.properties.name != geojson_obj.crs.properties.name
-        # check if input is actually transformed
-        assert geojson_obj_t != geojson_obj
-
-        with not_raises(  # check if we can roundtrip the transformed object without exceptions
-            ValidationError,
-            "could not convert output of transform_request_body to type"
-            + object_type.__name__
-            + ": {exc}",  # string concat with + otherwise mypy and ruff complains
-        ):
-            (
-                parse_geometry_obj(geojson_obj_t_dict)
-                if object_type is _GeometryBase
-                else object_type(**geojson_obj_t_dict)
-            )
-
-
-def test_2d_with_epoch():
-    with open("tests/data/test_2d_with_epoch.json") as f:
-        data = json.load(f)
-        feature = Feature(**data)
-        feature_2d_org = crs_transform(feature, str_to_crs("EPSG:3857"), str_to_crs("EPSG:28992"))
-        feature_2d_2000 = crs_transform(feature, str_to_crs("EPSG:3857"), str_to_crs("EPSG:28992"), 2000)
-        feature_2d_2020 = crs_transform(feature, str_to_crs("EPSG:3857"), str_to_crs("EPSG:28992"), 2020)
-
-        assert feature_2d_2000 != feature_2d_org
-        assert feature_2d_2020 != feature_2d_org
-
-        coords_2000 = feature_2d_2000.geometry.coordinates
-        coords_2020 = feature_2d_2020.geometry.coordinates
-        coords_org = feature_2d_org.geometry.coordinates
-
-        dif_2000_org = 0.39  # 0.29
-        dif_2020_org = 1.12  # 0.76
-
-        assert (
-            round(
-                math.sqrt(
-                    ((coords_2000[0] - coords_org[0]) * (coords_2000[0] - coords_org[0]))
-                    + ((coords_2000[1] - coords_org[1]) * (coords_2000[1] - coords_org[1]))
-                ),
-                2,
-            )
-            == dif_2000_org
-        )
-        assert (
-            round(
-                math.sqrt(
-                    ((coords_2020[0] - coords_org[0]) * (coords_2020[0] - coords_org[0]))
-                    + ((coords_2020[1] - coords_org[1]) * (coords_2020[1] - coords_org[1]))
-                ),
-                2,
-            )
-            == dif_2020_org
-        )
+def test_transform_geojson_objects(load_json_data, geojson_file, object_type):
+    data = load_json_data(geojson_file)
 
+    geojson_obj = parse_geometry_obj(data) if object_type is _GeometryBase else object_type.model_validate(data)
 
-def test_wm_epoch():
-    with open("tests/data/test_wm_epoch.json") as f:
-        data = json.load(f)
-        feature = Feature(**data)
+    geojson_obj_t = crs_transform(geojson_obj, str_to_crs("EPSG:28992"), str_to_crs("EPSG:4326"))
+    geojson_obj_t_dict = geojson_obj_t.model_dump(mode="json")
 
-        feature_2024 = crs_transform(feature, str_to_crs("EPSG:28992"), str_to_crs("EPSG:3857"), 2024)
-        feature_2010 = crs_transform(feature, str_to_crs("EPSG:28992"), str_to_crs("EPSG:3857"), 2010)
-        feature_epoch_none = crs_transform(feature, str_to_crs("EPSG:28992"), str_to_crs("EPSG:3857"))
+    if object_type is CrsFeatureCollection:
+        assert geojson_obj_t.crs.properties.name != geojson_obj.crs.properties.name
+    # check if input is actually transformed
+    assert geojson_obj_t.model_dump_json() != geojson_obj.model_dump_json()
 
-        assert feature_2024 != feature_2010
-        assert feature_2010 != feature_epoch_none
-        assert feature_epoch_none != feature_2024
+    with not_raises(  # check if we can roundtrip the transformed object without exceptions
+        ValidationError,
+        "could not convert output of transform_request_body to type"
+        + object_type.__name__
+        + ": {exc}",  # string concat with + otherwise mypy and ruff complains
+    ):
+        (
+            parse_geometry_obj(geojson_obj_t_dict)
+            if object_type is _GeometryBase
+            else object_type.model_validate(geojson_obj_t_dict)
+        )
 
-        coords_2024 = feature_2024.geometry.coordinates
-        coords_2010 = feature_2010.geometry.coordinates
-        coords_epoch_none = feature_epoch_none.geometry.coordinates
 
-        dif_2024_2010 = 0.55  # 0.34
-        dif_2024_epoch_none = 1.4  # 0.86
+def test_2d_with_epoch(load_json_data):
+    data = load_json_data("test_2d_with_epoch.json")
+    feature = Feature(**data)
+    feature_2d_org = crs_transform(feature, str_to_crs("EPSG:3857"), str_to_crs("EPSG:28992"))
+    feature_2d_2000 = crs_transform(feature, str_to_crs("EPSG:3857"), str_to_crs("EPSG:28992"), 2000)
+    feature_2d_2020 = crs_transform(feature, str_to_crs("EPSG:3857"), str_to_crs("EPSG:28992"), 2020)
 
-        assert (
-            round(
-                math.sqrt(
-                    ((coords_2024[0] - coords_2010[0]) * (coords_2024[0] - coords_2010[0]))
-                    + ((coords_2024[1] - coords_2010[1]) * (coords_2024[1] - coords_2010[1]))
-                ),
-                2,
-            )
-            == dif_2024_2010
+    feature_2d_org_json = feature_2d_org.model_dump_json()
+    assert feature_2d_2000.model_dump_json() != feature_2d_org_json
+    assert feature_2d_2020.model_dump_json() != feature_2d_org_json
+
+    coords_2000 = feature_2d_2000.geometry.coordinates
+    coords_2020 = feature_2d_2020.geometry.coordinates
+    coords_org = feature_2d_org.geometry.coordinates
+
+    dif_2000_org = 0.39  # 0.29
+    dif_2020_org = 1.12  # 0.76
+
+    assert (
+        round(
+            math.sqrt(
+                ((coords_2000[0] - coords_org[0]) * (coords_2000[0] - coords_org[0]))
+                + ((coords_2000[1] - coords_org[1]) * (coords_2000[1] - coords_org[1]))
+            ),
+            2,
+        )
+        == dif_2000_org
+    )
+    assert (
+        round(
+            math.sqrt(
+                ((coords_2020[0] - coords_org[0]) * (coords_2020[0] - coords_org[0]))
+                + ((coords_2020[1] - coords_org[1]) * (coords_2020[1] - coords_org[1]))
+            ),
+            2,
+        )
+        == dif_2020_org
+    )
+
+
+def test_wm_epoch(load_json_data):
+    data = load_json_data("test_wm_epoch.json")
+    feature = Feature(**data)
+
+    feature_2024 = crs_transform(feature, str_to_crs("EPSG:28992"), str_to_crs("EPSG:3857"), 2024)
+    feature_2010 = crs_transform(feature, str_to_crs("EPSG:28992"), str_to_crs("EPSG:3857"), 2010)
+    feature_epoch_none = crs_transform(feature, str_to_crs("EPSG:28992"), str_to_crs("EPSG:3857"))
+
+    feature_2024_json = feature_2024.model_dump_json()
+    feature_2010_json = feature_2010.model_dump_json()
+    feature_epoch_none_json = feature_epoch_none.model_dump_json()
+    assert feature_2024_json != feature_2010_json
+    assert feature_2010_json != feature_epoch_none_json
+    assert feature_epoch_none_json != feature_2024_json
+
+    coords_2024 = feature_2024.geometry.coordinates
+    coords_2010 = feature_2010.geometry.coordinates
+    coords_epoch_none = feature_epoch_none.geometry.coordinates
+
+    dif_2024_2010 = 0.55  # 0.34
+    dif_2024_epoch_none = 1.4  # 0.86
+
+    assert (
+        round(
+            math.sqrt(
+                ((coords_2024[0] - coords_2010[0]) * (coords_2024[0] - coords_2010[0]))
+                + ((coords_2024[1] - coords_2010[1]) * (coords_2024[1] - coords_2010[1]))
+            ),
+            2,
         )
-        assert (
-            round(
-                math.sqrt(
-                    ((coords_2024[0] - coords_epoch_none[0]) * (coords_2024[0] - coords_epoch_none[0]))
-                    + ((coords_2024[1] - coords_epoch_none[1]) * (coords_2024[1] - coords_epoch_none[1]))
-                ),
-                2,
-            )
-            == dif_2024_epoch_none
+        == dif_2024_2010
+    )
+    assert (
+        round(
+            math.sqrt(
+                ((coords_2024[0] - coords_epoch_none[0]) * (coords_2024[0] - coords_epoch_none[0]))
+                + ((coords_2024[1] - coords_epoch_none[1]) * (coords_2024[1] - coords_epoch_none[1]))
+            ),
+            2,
         )
+        == dif_2024_epoch_none
+    )
+
+
+def test_transform_positions_mixed_dimensions():
+    source_crs = str_to_crs("EPSG:7415")
+    target_crs = str_to_crs("EPSG:28992")
+    positions = [
+        Position2D(155000.0, 463000.0),
+        Position3D(156000.0, 464000.0, 5.0),
+        Position2D(100000.0, 400000.0),
+    ]
+
+    transform_fun = get_transform_crs_fun(source_crs, target_crs)
+    positions_t = get_transform_crs_batch_fun(source_crs, target_crs)(positions)
+
+    assert positions_t == [transform_fun(position) for position in positions]
+
+
+def test_no_transformer_when_source_and_target_crs_are_equal():
+    with patch(
+        "coordinate_transformation_api.crs_transform.get_transformer",
+        side_effect=get_transformer,
+    ) as get_transformer_call:
+        transform_fun = get_transform_crs_fun(str_to_crs("EPSG:28992"), str_to_crs("EPSG:28992"))
+        get_transformer_call.assert_not_called()
+
+    assert transform_fun(Position2D(155000.123456, 463000.0)) == Position2D(155000.1235, 463000.0)
+
+
+@pytest.mark.parametrize(
+    ("source_crs", "target_crs"),
+    [
+        ("EPSG:7415", "EPSG:7415"),
+        ("EPSG:7931", "EPSG:4979"),
+        ("EPSG:4979", "EPSG:4979"),
+    ],
+)
+def test_transform_positions_nan_height_raises(source_crs, target_crs):
+    transform_fun = get_transform_crs_batch_fun(str_to_crs(source_crs), str_to_crs(target_crs))
+
+    with pytest.raises(InfValCoordinateError):
+        transform_fun([Position3D(5.0, 52.0, 0.0), Position3D(5.0, 52.0, math.nan)])
+
+
+@pytest.mark.parametrize(
+    "position",
+    [
+        Position2D(math.inf, 463000.0),
+        Position2D(155000.0, math.nan),
+    ],
+)
+def test_transform_positions_identity_non_finite_raises(position):
+    transform_fun = get_transform_crs_batch_fun(str_to_crs("EPSG:28992"), str_to_crs("EPSG:28992"))
+
+    with pytest.raises(InfValCoordinateError):
+        transform_fun([Position2D(155000.0, 463000.0), position])
+
+
+def test_transform_positions_identity_inf_height_dropped():
+    transform_fun = get_transform_crs_batch_fun(str_to_crs("EPSG:4979"), str_to_crs("EPSG:4979"))
+
+    assert transform_fun([Position3D(5.0, 52.0, 10.0), Position3D(5.0, 52.0, math.inf)]) == [
+        Position3D(5.0, 52.0, 10.0),
+        Position2D(5.0, 52.0),
+    ]
+
+
+def test_target_dimension():
+    assert get_target_dimension(get_transformer(str_to_crs("EPSG:7415"), str_to_crs("EPSG:28992"), None)) == 2  # noqa: PLR2004
+    assert get_target_dimension(get_transformer(str_to_crs("EPSG:28992"), str_to_crs("EPSG:7415"), None)) == 3  # noqa: PLR2004
+
+    with pytest.raises(ValueError, match="dimension of target-crs should be 2 or 3, is 1"):
+        get_target_dimension(Transformer.from_crs("EPSG:5709", "EPSG:5709", always_xy=True))  # height only crs
+
+
+def test_transform_geometry_matches_pyproj_batch_transformation(load_json_data):
+    source_crs = str_to_crs("EPSG:28992")
+    target_crs = str_to_crs("EPSG:4326")
+    geometry = parse_geometry_obj(load_json_data("geometry.json"))
+
+    # transform all positions with a single pyproj call on coordinate arrays
+    positions = explode(geometry.coordinates)
+    xs, ys = get_transformer(source_crs, target_crs, None).transform(
+        [position[0] for position in positions], [position[1] for position in positions]
+    )
+    precision = get_precision(target_crs)
+    expected_positions = [(round(x, precision), round(y, precision)) for x, y in zip(xs, ys, strict=True)]
+
+    geometry_t = crs_transform(geometry, source_crs, target_crs)
+
+    assert [tuple(position) for position in explode(geometry_t.coordinates)] == expected_positions
+    expected_xs, expected_ys = zip(*expected_positions, strict=True)
+    assert geometry_t.bbox == (min(expected_xs), min(expected_ys), max(expected_xs), max(expected_ys))
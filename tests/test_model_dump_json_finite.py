@@ -0,0 +1,36 @@
+import math
+
+import pytest
+from geojson_pydantic import Feature
+
+from coordinate_transformation_api.util import model_dump_json_finite
+
+
+def _feature(coordinates, properties=None):
+    return Feature(
+        type="Feature",
+        geometry={"type": "LineString", "coordinates": coordinates},
+        properties=properties,
+    )
+
+
+@pytest.mark.parametrize(
+    "coordinates",
+    [
+        [[155000.0, math.nan], [156000.0, 464000.0]],
+        [[155000.0, 463000.0], [math.inf, 464000.0]],
+        [[155000.0, 463000.0, -math.inf], [156000.0, 464000.0, 1.0]],
+    ],
+)
+def test_model_dump_json_finite_raises_on_non_finite(coordinates):
+    with pytest.raises(ValueError, match="Out of range float values are not JSON compliant"):
+        model_dump_json_finite(_feature(coordinates))
+
+
+def test_model_dump_json_finite():
+    feature = _feature([[155000.0, 463000.0], [156000.0, 464000.0]], properties={"name": None})
+
+    result = model_dump_json_finite(feature)
+
+    assert result == feature.model_dump_json(exclude_none=True)
+    assert "null" in result
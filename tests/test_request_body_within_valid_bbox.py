@@ -2,6 +2,7 @@ import pytest
 from geodense.geojson import CrsFeatureCollection
 from geojson_pydantic import Feature
 
+from coordinate_transformation_api.constants import DENSIFY_CRS_2D, DENSIFY_CRS_3D
 from coordinate_transformation_api.util import request_body_within_valid_bbox
 
 
@@ -48,9 +49,97 @@ from coordinate_transformation_api.util import request_body_within_valid_bbox
             "NSGI:Saba_DPnet_Height",
             False,
         ),
+        (
+            Feature(
+                **{
+                    "type": "Feature",
+                    "properties": {},
+                    "bbox": [156264.9063, 601302.5889, 165681.9644, 605544.3131],
+                    "geometry": {
+                        "type": "LineString",
+                        "coordinates": [
+                            [156264.9063, 601302.5889],
+                            [165681.9644, 605544.3131],
+                        ],
+                    },
+                }
+            ),
+            "EPSG:28992",
+            True,
+        ),
+        (
+            Feature(
+                **{
+                    "type": "Feature",
+                    "properties": {},
+                    "geometry": {
+                        "type": "LineString",
+                        "coordinates": [[5.0, 52.0], [5.5, 52.5]],
+                    },
+                }
+            ),
+            DENSIFY_CRS_2D,
+            True,
+        ),
+        (
+            Feature(
+                **{
+                    "type": "Feature",
+                    "properties": {},
+                    "geometry": {
+                        "type": "LineString",
+                        "coordinates": [[10.0, 52.0, 0.0], [10.5, 52.5, 0.0]],
+                    },
+                }
+            ),
+            DENSIFY_CRS_3D,
+            False,
+        ),
+        (
+            # incorrect bbox outside the valid bbox, coordinates are within the valid bbox
+            Feature(
+                **{
+                    "type": "Feature",
+                    "properties": {},
+                    "bbox": [10.0, 52.0, 10.5, 52.5],
+                    "geometry": {
+                        "type": "LineString",
+                        "coordinates": [[5.0, 52.0], [5.5, 52.5]],
+                    },
+                }
+            ),
+            DENSIFY_CRS_2D,
+            True,
+        ),
+        (
+            # incorrect bboxes within the valid bbox, coordinates are outside the valid bbox
+            CrsFeatureCollection(
+                **{
+                    "type": "FeatureCollection",
+                    "bbox": [5.0, 52.0, 5.5, 52.5],
+                    "features": [
+                        {
+                            "type": "Feature",
+                            "properties": {},
+                            "bbox": [5.0, 52.0, 5.5, 52.5],
+                            "geometry": {
+                                "type": "LineString",
+                                "bbox": [5.0, 52.0, 5.5, 52.5],
+                                "coordinates": [[10.0, 52.0], [10.5, 52.5]],
+                            },
+                        }
+                    ],
+                }
+            ),
+            DENSIFY_CRS_2D,
+            False,
+        ),
     ],
 )
 def test_request_body_within_valid_bbox(geojson, source_crs, expectation):
+    bbox = geojson.bbox
     result = request_body_within_valid_bbox(geojson, source_crs)
 
     assert result == expectation
+    # bbox of the request body is not changed by the check
+    assert geojson.bbox == bbox
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from coordinate_transformation_api.crs_transform import (
@@ -25,6 +26,12 @@ def test_time_dependant_operation_method(source, target, epoch, expectation):
     assert needs_epoch(get_transformer(str_to_crs(source), str_to_crs(target), epoch)) == expectation
 
 
+def test_transformer_reused_for_different_epochs():
+    source_crs = str_to_crs("EPSG:7415")
+    target_crs = str_to_crs("EPSG:3857")
+    assert get_transformer(source_crs, target_crs, 2013.3) is get_transformer(source_crs, target_crs, 2020.0)
+
+
 @pytest.mark.parametrize(
     ("coord", "epoch", "expectation"),
     [
@@ -35,4 +42,25 @@ def test_time_dependant_operation_method(source, target, epoch, expectation):
     ],
 )
 def test_build_input_coord(coord, epoch, expectation):
-    assert build_input_coord(coord, epoch) == expectation
+    result = build_input_coord(coord, epoch)
+
+    # single coordinate values result in float (or None) values, not in 0-d arrays
+    assert all(val is None or type(val) is float for val in result)
+    assert result == expectation
+
+
+@pytest.mark.parametrize(
+    ("coord", "epoch", "expectation"),
+    [
+        ((np.array([1000, 1001]), np.array([1000, 1001])), 2010.5, [[0.0, 0.0], [2010.5, 2010.5]]),
+        ((np.array([1000, 1001]), np.array([1000, 1001]), np.array([10, 11])), 2010.5, [[2010.5, 2010.5]]),
+    ],
+)
+def test_build_input_coord_arrays(coord, epoch, expectation):
+    result = build_input_coord(coord, epoch)
+
+    assert len(result) == len(coord) + len(expectation)
+    for values, expected_values in zip(result[len(coord) :], expectation, strict=True):
+        # epoch of int coordinates is not truncated to int
+        assert values.dtype == np.float64
+        np.testing.assert_array_equal(values, expected_values)
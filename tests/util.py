@@ -25,6 +25,13 @@ def not_raises(exception, message: str | None = ""):
             raise pytest.fail(message.format(exc=exception))  # noqa: B904
 
 
+def explode(coords):
+    """Return the positions of a GeoJSON coordinates object as flat list, in document order"""
+    if coords and isinstance(coords[0], float | int):
+        return [coords]
+    return [position for item in coords for position in explode(item)]
+
+
 def do_pyproj_transformation(source_crs: str, target_crs: str, coords: tuple[float, ...]) -> tuple[float, ...]:
     tfg = transformer.TransformerGroup(source_crs, target_crs, allow_ballpark=False, always_xy=True)
 